@@ -0,0 +1,114 @@
+#
+# Copyright (c) 2022,2023 Robert Gill <rtgill82@gmail.com>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import unittest
+
+from xpost.facets import _trim_link, facets, mentions
+
+def spans(text, dids = {}):
+    result = []
+    for facet in facets(text, dids) or []:
+        feature = facet.features[0]
+        value = getattr(feature, 'uri', None) or \
+                getattr(feature, 'did', None) or feature.tag
+        encoded = text.encode('utf-8')
+        index = facet.index
+        result.append((value, encoded[index.byte_start:index.byte_end]))
+
+    return result
+
+
+class TestMentions(unittest.TestCase):
+    def test_mentions(self):
+        text = 'hi @alice.bsky.social and @Bob.example.com.'
+        self.assertEqual(mentions(text),
+                         ['alice.bsky.social', 'Bob.example.com'])
+
+    def test_ignores_email_addresses(self):
+        self.assertEqual(mentions('mail me at user@example.com'), [])
+
+
+class TestFacets(unittest.TestCase):
+    def test_no_facets(self):
+        self.assertIsNone(facets('just text', {}))
+
+    def test_multibyte_offsets(self):
+        text = 'héllo ✨ @alice.bsky.social 日本 #タグ https://example.com/ü'
+        dids = { 'alice.bsky.social': 'did:plc:alice' }
+        self.assertEqual(spans(text, dids), [
+            ('did:plc:alice', '@alice.bsky.social'.encode('utf-8')),
+            ('タグ', '#タグ'.encode('utf-8')),
+            ('https://example.com/ü', 'https://example.com/ü'.encode('utf-8')),
+        ])
+
+    def test_emoji_offsets(self):
+        text = '👩‍💻🎉 #release'
+        facet = facets(text, {})[0]
+        self.assertEqual(facet.index.byte_start, len('👩‍💻🎉 '.encode('utf-8')))
+        self.assertEqual(facet.index.byte_end, len(text.encode('utf-8')))
+
+    def test_unresolved_mention_is_plain_text(self):
+        self.assertIsNone(facets('hi @alice.bsky.social', {}))
+
+    def test_tags_and_mentions_inside_links(self):
+        text = 'see https://example.com/@bob.example.com#section'
+        dids = { 'bob.example.com': 'did:plc:bob' }
+        self.assertEqual([value for value, _ in spans(text, dids)],
+                         ['https://example.com/@bob.example.com#section'])
+
+    def test_numeric_tag(self):
+        self.assertIsNone(facets('issue #123', {}))
+
+    def test_long_tag(self):
+        self.assertIsNone(facets('#' + 'a' * 65, {}))
+        self.assertEqual(spans('#' + 'a' * 64), [('a' * 64, b'#' + b'a' * 64)])
+
+    def test_link_without_host(self):
+        self.assertIsNone(facets('see https://.', {}))
+        self.assertIsNone(facets('see https://)', {}))
+
+
+class TestTrimLink(unittest.TestCase):
+    def test_trailing_punctuation(self):
+        self.assertEqual(_trim_link('https://example.com/a.'),
+                         'https://example.com/a')
+        self.assertEqual(_trim_link('https://example.com/a?!"'),
+                         'https://example.com/a')
+
+    def test_unbalanced_parenthesis(self):
+        self.assertEqual(_trim_link('https://example.com/a),'),
+                         'https://example.com/a')
+
+    def test_balanced_parenthesis(self):
+        self.assertEqual(_trim_link('https://en.wikipedia.org/wiki/A_(b)'),
+                         'https://en.wikipedia.org/wiki/A_(b)')
+
+
+if __name__ == '__main__':
+    unittest.main()
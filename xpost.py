@@ -31,9 +31,15 @@
 import argparse
 import os
 import sys
+import time
 import tomllib
 
+IMPORT_START = time.perf_counter()
+
 from xpost import Bsky, Mastodon, Post, Twitter
+from xpost.profiling import profiler
+
+IMPORT_TIME = time.perf_counter() - IMPORT_START
 
 
 def read_config():
@@ -44,21 +50,24 @@ def read_config():
         sys.exit(1)
     path = f"{ home }/.xpostrc"
     with open(f'{ home }/.xpostrc', 'rb') as f:
-        data = tomllib.load(f)
-        if 'bsky' in data:
-            for account in data['bsky']:
-                config = Bsky.Config(**account)
-                accounts.append(Bsky(config))
-
-        if 'mastodon' in data:
-            for account in data['mastodon']:
-                config = Mastodon.Config(**account)
-                accounts.append(Mastodon(config))
-
-        if 'twitter' in data:
-            for account in data['twitter']:
-                config = Twitter.Config(**account)
-                accounts.append(Twitter(config))
+        with profiler.phase('config'):
+            data = tomllib.load(f)
+
+        with profiler.phase('client'):
+            if 'bsky' in data:
+                for account in data['bsky']:
+                    config = Bsky.Config(**account)
+                    accounts.append(Bsky(config))
+
+            if 'mastodon' in data:
+                for account in data['mastodon']:
+                    config = Mastodon.Config(**account)
+                    accounts.append(Mastodon(config))
+
+            if 'twitter' in data:
+                for account in data['twitter']:
+                    config = Twitter.Config(**account)
+                    accounts.append(Twitter(config))
 
     return accounts
 
@@ -85,16 +94,65 @@ def read_messages():
     yield Post(message.rstrip())
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        prog = 'xpost.py',
-        description = 'Mastodon and Twitter cross-poster'
-        )
+def write_profile(f, stats, snapshot):
+    import pstats
 
-    parser.add_argument('-i', '--image', action = 'append',
-                        help = 'attach an image to post')
+    f.write('Phase timings printed alongside this report include '
+            'cProfile and tracemalloc overhead.\n\n')
+    f.write('cProfile (main thread and upload workers, '
+            'by cumulative time)\n\n')
+    report = pstats.Stats(stats, stream=f)
+    for worker in profiler.worker_stats():
+        report.add(worker)
+    report.sort_stats('cumulative').print_stats(50)
 
-    args = parser.parse_args()
+    f.write('tracemalloc (top allocations by line)\n\n')
+    for stat in snapshot.statistics('lineno')[:25]:
+        f.write(f'{ stat }\n')
+
+
+def profile(args):
+    profiler.enable()
+    profiler.record('import', IMPORT_TIME)
+
+    if not args.profile:
+        try:
+            run(args)
+        finally:
+            profiler.report()
+        return
+
+    try:
+        f = open(args.profile, 'w')
+    except OSError as e:
+        print(f'Unable to open profile: { e }.', file=sys.stderr)
+        sys.exit(1)
+
+    import cProfile, tracemalloc
+
+    with f:
+        tracemalloc.start()
+        stats = cProfile.Profile()
+        profiler.capture()
+        stats.enable()
+
+        try:
+            run(args)
+        finally:
+            stats.disable()
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            try:
+                write_profile(f, stats, snapshot)
+            except Exception as e:
+                print(f'Unable to write profile: { e }.', file=sys.stderr)
+
+            print('Timings include cProfile and tracemalloc overhead.',
+                  file=sys.stderr)
+            profiler.report()
+
+
+def run(args):
     accounts = read_config()
 
     for post in read_messages():
@@ -110,5 +168,27 @@ def main():
         account.publish()
 
 
+def main():
+    parser = argparse.ArgumentParser(
+        prog = 'xpost.py',
+        description = 'Mastodon and Twitter cross-poster'
+        )
+
+    parser.add_argument('-i', '--image', action = 'append',
+                        help = 'attach an image to post')
+
+    parser.add_argument('-p', '--profile', nargs = '?', const = '',
+                        metavar = 'FILE',
+                        help = 'print a timing breakdown of each phase; '
+                               'with FILE also write cProfile and '
+                               'tracemalloc reports to FILE')
+
+    args = parser.parse_args()
+    if args.profile is None:
+        run(args)
+    else:
+        profile(args)
+
+
 if __name__ == "__main__":
     main()
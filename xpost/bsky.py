@@ -27,9 +27,15 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 
+import os, sys
+
 from atproto import AtUri, Client, exceptions, models
+from xpost.facets import HandleResolver, facets, mentions
+from xpost.profiling import profiler
 from xpost.social_network import SocialNetwork
 
+_resolver = HandleResolver(os.path.expanduser('~/.xpost_handles.json'))
+
 class Bsky(SocialNetwork):
     CHAR_LIMIT = 300
     IMAGE_LIMIT = 4
@@ -39,29 +45,23 @@ class Bsky(SocialNetwork):
         self.__user = config.user()
         self.__password = config.password()
         self.__logged_in = False
+        self.__dids = {}
 
     def client(self):
-        self._client = self._client or Client()
+        if not self._client:
+            with profiler.phase('client'):
+                self._client = Client()
+
         if not self.__logged_in:
-            self._client.login(self.__user, self.__password)
+            with profiler.phase('login'):
+                self._client.login(self.__user, self.__password)
+            self.__logged_in = True
 
         return self._client
 
     def publish(self):
-        response = None
-        post_ids = []
-
-        client = self.client()
-        for post in self.posts():
-            try:
-                response = self._try(self._send_post, post, response)
-            except Exception as e:
-                self.delete(*post_ids)
-                raise e
-
-            post_ids.append(response)
-
-        return post_ids
+        self.__dids = self.__resolve_mentions()
+        return self._publish(self._upload, self._send_post)
 
     def delete(self, *posts):
         client = self.client()
@@ -73,36 +73,33 @@ class Bsky(SocialNetwork):
                 print(f'Unable to delete post: { e }.', file=sys.stderr)
                 next
 
-    def _send_post(self, post, response = None):
+    def _send_post(self, post, image_refs, response = None):
         response = self.client().send_post(
                 text = post.text(),
+                facets = facets(post.text(), self.__dids),
                 reply_to = _reply_ref(response),
-                embed = self._embed_ref(post)
+                embed = _embed_ref(image_refs)
                 )
 
         return response
 
-    def _embed_ref(self, post):
-        embed_ref = None
-        images = post.images()
+    def __resolve_mentions(self):
+        handles = []
+        for post in self.posts():
+            handles.extend(mentions(post.text()))
 
         client = self.client()
-        upload_blob = lambda data: client.com.atproto.repo.upload_blob(data)
+        with profiler.phase('resolve'):
+            return _resolver.resolve(client, *handles)
 
-        if len(images) > 0:
-            image_refs = []
-            for image in images:
-                with open(image, 'rb') as f:
-                    upload = self._try(upload_blob, f.read())
-                    image_ref = models.AppBskyEmbedImages.Image(
-                            alt = '',
-                            image = upload.blob
-                            )
-                    image_refs.append(image_ref)
+    def _upload(self, image):
+        client = self.client()
+        upload_blob = lambda data: client.com.atproto.repo.upload_blob(data)
 
-            embed_ref = models.AppBskyEmbedImages.Main(images=image_refs)
+        with open(image, 'rb') as f:
+            upload = self._try(upload_blob, f.read())
 
-        return embed_ref
+        return models.AppBskyEmbedImages.Image(alt = '', image = upload.blob)
 
     def __str__(self):
         return f'Bsky Account: { self.__user }'
@@ -119,6 +116,15 @@ class Bsky(SocialNetwork):
             return self.__password
 
 
+def _embed_ref(image_refs):
+    embed_ref = None
+
+    if image_refs:
+        embed_ref = models.AppBskyEmbedImages.Main(images=image_refs)
+
+    return embed_ref
+
+
 def _reply_ref(response):
     reply_ref = None
 
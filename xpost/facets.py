@@ -0,0 +1,188 @@
+#
+# Copyright (c) 2022,2023 Robert Gill <rtgill82@gmail.com>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import json, re, sys, threading, time
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from atproto import models
+
+LINK_RE = re.compile(r'(?<![\w/])(https?://[^\s<>"]+)')
+MENTION_RE = re.compile(r'(?<![\w@/.])@((?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}'
+                        r'[a-zA-Z0-9])?\.)+[a-zA-Z](?:[a-zA-Z0-9-]{0,61}'
+                        r'[a-zA-Z0-9])?)')
+TAG_RE = re.compile(r'(?<![\w#&/])#(\w*[^\W\d]\w*)')
+
+LINK_TRAILING = '.,;:!?\'"'
+TAG_MAX_CHARS = 64
+TAG_MAX_BYTES = 640
+
+class HandleResolver:
+    TTL = 24 * 3600
+    WORKERS = 8
+
+    def __init__(self, path = None, ttl = TTL, workers = WORKERS):
+        self.__path = path
+        self.__ttl = ttl
+        self.__workers = workers
+        self.__cache = None
+        self.__lock = threading.Lock()
+
+    def resolve(self, client, *handles):
+        dids = {}
+        misses = []
+
+        now = time.time()
+        with self.__lock:
+            cache = self.__load()
+            for handle in set(h.lower() for h in handles):
+                entry = cache.get(handle)
+                if entry and entry[1] > now:
+                    dids[handle] = entry[0]
+                else:
+                    misses.append(handle)
+
+        if len(misses) > 0:
+            lookup = lambda handle: self.__lookup(client, handle)
+            workers = min(self.__workers, len(misses))
+            with ThreadPoolExecutor(max_workers = workers) as executor:
+                results = list(executor.map(lookup, misses))
+
+            expires = time.time() + self.__ttl
+            with self.__lock:
+                for handle, did in zip(misses, results):
+                    if did:
+                        self.__cache[handle] = (did, expires)
+                        dids[handle] = did
+                self.__save()
+
+        return dids
+
+    def __load(self):
+        if self.__cache is not None:
+            return self.__cache
+
+        self.__cache = {}
+        if self.__path:
+            try:
+                with open(self.__path, 'r') as f:
+                    data = json.load(f)
+                self.__cache = { handle: (entry[0], entry[1])
+                                 for handle, entry in data.items() }
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f'Unable to read handle cache: { e }.', file=sys.stderr)
+
+        return self.__cache
+
+    def __save(self):
+        if not self.__path:
+            return
+
+        now = time.time()
+        data = { handle: list(entry) for handle, entry in self.__cache.items()
+                 if entry[1] > now }
+        try:
+            with open(self.__path, 'w') as f:
+                json.dump(data, f)
+        except Exception as e:
+            print(f'Unable to write handle cache: { e }.', file=sys.stderr)
+
+    def __lookup(self, client, handle):
+        try:
+            params = { 'handle': handle }
+            return client.com.atproto.identity.resolve_handle(params).did
+        except Exception as e:
+            print(f'Unable to resolve handle @{ handle }: { e }.',
+                  file=sys.stderr)
+            return None
+
+
+def mentions(text):
+    return [m.group(1) for m in MENTION_RE.finditer(text)]
+
+
+def facets(text, dids):
+    spans = []
+    links = []
+
+    for m in LINK_RE.finditer(text):
+        uri = _trim_link(m.group(1))
+        if not urlsplit(uri).netloc:
+            continue
+
+        start, end = m.start(1), m.start(1) + len(uri)
+        links.append((start, end))
+        spans.append((start, end, models.AppBskyRichtextFacet.Link(uri = uri)))
+
+    inside_link = lambda pos: any(s <= pos < e for s, e in links)
+
+    for m in MENTION_RE.finditer(text):
+        did = dids.get(m.group(1).lower())
+        if did and not inside_link(m.start()):
+            feature = models.AppBskyRichtextFacet.Mention(did = did)
+            spans.append((m.start(), m.end(), feature))
+
+    for m in TAG_RE.finditer(text):
+        if not inside_link(m.start()) and _valid_tag(m.group(1)):
+            feature = models.AppBskyRichtextFacet.Tag(tag = m.group(1))
+            spans.append((m.start(), m.end(), feature))
+
+    result = []
+    for start, end, feature in sorted(spans, key = lambda span: span[0]):
+        index = models.AppBskyRichtextFacet.ByteSlice(
+                byte_start = _byte_offset(text, start),
+                byte_end = _byte_offset(text, end)
+                )
+        result.append(models.AppBskyRichtextFacet.Main(
+                features = [feature],
+                index = index
+                ))
+
+    return result or None
+
+
+def _byte_offset(text, pos):
+    return len(text[:pos].encode('utf-8'))
+
+
+def _valid_tag(tag):
+    return (len(tag) <= TAG_MAX_CHARS and
+            len(tag.encode('utf-8')) <= TAG_MAX_BYTES)
+
+
+def _trim_link(uri):
+    while True:
+        if uri[-1] in LINK_TRAILING:
+            uri = uri[:-1]
+        elif uri[-1] == ')' and uri.count('(') < uri.count(')'):
+            uri = uri[:-1]
+        else:
+            return uri
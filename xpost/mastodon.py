@@ -29,6 +29,7 @@
 
 import mastodon, sys
 
+from xpost.profiling import profiler
 from xpost.social_network import SocialNetwork
 
 class Mastodon(SocialNetwork):
@@ -48,25 +49,15 @@ class Mastodon(SocialNetwork):
 
     def client(self):
         if not self.__logged_in:
-            self._client.log_in(self.__user, self.__password,
-                                scopes = Mastodon.SCOPES)
+            with profiler.phase('login'):
+                self._client.log_in(self.__user, self.__password,
+                                    scopes = Mastodon.SCOPES)
+            self.__logged_in = True
 
         return self._client
 
     def publish(self):
-        reply_id = None
-        post_ids = []
-
-        for post in self.posts():
-            try:
-                reply_id = self._try(self.__post, post, reply_id)
-            except Exception as e:
-                self.delete(*post_ids)
-                raise e
-
-            post_ids.append(reply_id)
-
-        return post_ids
+        return self._publish(self.__upload, self.__post)
 
     def delete(self, *posts):
         client = self.client()
@@ -77,28 +68,18 @@ class Mastodon(SocialNetwork):
                 print(f'Unable to delete post: { e }.', file=sys.stderr)
                 next
 
-    def __post(self, post, reply_id = None):
+    def __post(self, post, media_ids, reply_id = None):
         response = self.client().status_post(
                 post.text(),
                 in_reply_to_id = reply_id,
-                media_ids = self.__upload(post)
+                media_ids = media_ids
                 )
 
         return response.id
 
-    def __upload(self, post):
-        media_ids = None
-        images = post.images()
+    def __upload(self, image):
         media_post = lambda image: self.client().media_post(image)
-
-        if len(images) > 0:
-            media_ids = []
-
-            for image in images:
-                media = self._try(media_post, image)
-                media_ids.append(media.id)
-
-        return media_ids
+        return self._try(media_post, image).id
 
     def __str__(self):
         return f'Mastodon Account: { self.__user }'
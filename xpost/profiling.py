@@ -0,0 +1,106 @@
+#
+# Copyright (c) 2022,2023 Robert Gill <rtgill82@gmail.com>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import sys, threading, time
+
+from contextlib import contextmanager
+
+class Profiler:
+    def __init__(self):
+        self.__enabled = False
+        self.__phases = {}
+        self.__lock = threading.Lock()
+        self.__worker_profile = None
+        self.__worker_stats = []
+
+    def enable(self):
+        self.__enabled = True
+
+    def capture(self):
+        import cProfile
+
+        self.__worker_profile = cProfile.Profile
+
+    def worker_stats(self):
+        with self.__lock:
+            return list(self.__worker_stats)
+
+    def record(self, name, elapsed):
+        if not self.__enabled:
+            return
+
+        with self.__lock:
+            calls, total = self.__phases.get(name, (0, 0.0))
+            self.__phases[name] = (calls + 1, total + elapsed)
+
+    @contextmanager
+    def phase(self, name):
+        if not self.__enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name, fn):
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                if self.__worker_profile and not _main_thread():
+                    return self.__runcall(fn, *args, **kwargs)
+
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    def __runcall(self, fn, *args, **kwargs):
+        stats = self.__worker_profile()
+        try:
+            return stats.runcall(fn, *args, **kwargs)
+        finally:
+            with self.__lock:
+                self.__worker_stats.append(stats)
+
+    def phases(self):
+        with self.__lock:
+            return dict(self.__phases)
+
+    def report(self, file = sys.stderr):
+        print(f'{ "phase":<12} { "calls":>6} { "seconds":>10}', file=file)
+        for name, (calls, total) in self.phases().items():
+            print(f'{ name:<12} { calls:>6} { total:>10.4f}', file=file)
+
+
+def _main_thread():
+    return threading.current_thread() is threading.main_thread()
+
+
+profiler = Profiler()
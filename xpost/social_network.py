@@ -27,12 +27,17 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 
+import itertools
 import xpost
+
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from xpost.exceptions import XpostError
+from xpost.profiling import profiler
 
 class SocialNetwork:
     CHAR_LIMIT = 0
     IMAGE_LIMIT = 0
+    UPLOAD_WORKERS = 4
 
     def __init__(self):
         self._client = None
@@ -63,6 +68,38 @@ class SocialNetwork:
     def delete(self, *posts):
         raise NotImplementedError
 
+    def _publish(self, upload, send):
+        reply = None
+        post_ids = []
+        upload = profiler.timed('upload', upload)
+        send = profiler.timed('post', send)
+
+        self.client()
+        with ThreadPoolExecutor(max_workers = self.UPLOAD_WORKERS) as executor:
+            uploads = [[executor.submit(upload, image) for image in post.images()]
+                       for post in self.posts()]
+
+            done, pending = wait(itertools.chain.from_iterable(uploads),
+                                 return_when = FIRST_EXCEPTION)
+            for future in done:
+                if future.exception():
+                    for waiting in pending:
+                        waiting.cancel()
+                    raise future.exception()
+
+            for post, futures in zip(self.posts(), uploads):
+                try:
+                    media = [future.result() for future in futures] or None
+                    reply = self._try(send, post, media, reply)
+                except Exception as e:
+                    with profiler.phase('rollback'):
+                        self.delete(*post_ids)
+                    raise e
+
+                post_ids.append(reply)
+
+        return post_ids
+
     def _try(self, fn, *args, **kwargs):
         exception = None
         result = None
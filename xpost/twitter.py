@@ -27,9 +27,11 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 
-import tweepy
+import sys, tweepy
 
 import xpost
+from xpost.exceptions import XpostError
+from xpost.profiling import profiler
 from xpost.social_network import SocialNetwork
 
 class Twitter(SocialNetwork):
@@ -40,25 +42,20 @@ class Twitter(SocialNetwork):
         super().__init__()
         self.__user = config.user()
         self.__tokens = config.tokens()
+        self.__api = None
 
     def client(self):
-        self._client = self._client or tweepy.Client(**self.__tokens)
+        if not self._client:
+            with profiler.phase('client'):
+                self._client = tweepy.Client(**self.__tokens)
+
         return self._client
 
     def publish(self):
-        reply_id = None
-        post_ids = []
-
-        for post in self.posts():
-            try:
-                reply_id = self._try(self.__post, post, reply_id)
-            except Exception as e:
-                self.delete(*post_ids)
-                raise e
+        if any(post.images() for post in self.posts()):
+            self.__api = self.__api or self.__api_auth()
 
-            post_ids.append(reply_id)
-
-        return post_ids
+        return self._publish(self.__upload, self.__post)
 
     def delete(self, *posts):
         client = self.client()
@@ -69,27 +66,17 @@ class Twitter(SocialNetwork):
                 print(f'Unable to delete post: { e }.', file=sys.stderr)
                 next
 
-    def __post(self, post, reply_id = None):
+    def __post(self, post, media_ids, reply_id = None):
         response = self.client().create_tweet(
                 text = post.text(),
                 in_reply_to_tweet_id = reply_id,
-                media_ids = self.__upload(post)
+                media_ids = media_ids
                 )
 
         return response.data['id']
 
-    def __upload(self, post):
-        media_ids = None
-        images = post.images()
-
-        if len(images) > 0:
-            api = self.__api_auth()
-            media_ids = []
-            for image in images:
-                media = self._try(api.media_upload, image)
-                media_ids.append(media.media_id)
-
-        return media_ids
+    def __upload(self, image):
+        return self._try(self.__api.media_upload, image).media_id
 
     def __api_auth(self):
         exception = None